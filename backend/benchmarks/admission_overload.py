@@ -0,0 +1,78 @@
+"""
+
+Load-test scenario for admission control under overload
+
+simulated slow database: pool of 10 connections, 50ms per query (200 rps capacity),
+offered load is 2000 concurrent requests, so without admission control everything queues on the pool
+
+run from backend dir:
+    python -m benchmarks.admission_overload
+
+prints p50/p99 latency of successful requests and responses by status, with and without the middleware
+
+"""
+import asyncio
+import time
+from collections import Counter
+from statistics import quantiles
+
+import httpx
+from fastapi import FastAPI
+
+from src.libs.admission import AdmissionControlMiddleware
+
+POOL_SIZE = 10
+QUERY_TIME = 0.05
+REQUESTS = 2000
+
+
+def get_app(admission: bool) -> FastAPI:
+    app = FastAPI()
+    pool = asyncio.Semaphore(POOL_SIZE)
+
+    @app.get("/users/")
+    async def users():
+        async with pool:
+            await asyncio.sleep(QUERY_TIME)
+        return {"message": "ok"}
+
+    if admission:
+        # rate limit is out of the scope here, all requests come from one client address
+        app.add_middleware(
+            AdmissionControlMiddleware,
+            default_limit=POOL_SIZE,
+            max_queue=100,
+            max_wait=0.2,
+            rate=10 ** 9,
+            burst=10 ** 9,
+        )
+
+    return app
+
+
+async def request(client: httpx.AsyncClient, results: list) -> None:
+    started_at = time.perf_counter()
+    response = await client.get("/users/")
+    results.append((response.status_code, time.perf_counter() - started_at))
+
+
+async def run(admission: bool) -> None:
+    results = []
+    transport = httpx.ASGITransport(app=get_app(admission))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await asyncio.gather(*(request(client, results) for _ in range(REQUESTS)))
+
+    ok = [latency * 1000 for status, latency in results if status == 200]
+    percentiles = quantiles(ok, n=100)
+    statuses = dict(Counter(status for status, _ in results))
+
+    print(
+        f"admission={admission!s:>5}: p50={percentiles[49]:.0f}ms p99={percentiles[98]:.0f}ms "
+        f"max={max(ok):.0f}ms statuses={statuses}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(run(admission=False))
+    asyncio.run(run(admission=True))
@@ -0,0 +1,81 @@
+"""
+
+Benchmark of API responses serialization for lists of DTOs
+
+compares FastAPI default pipeline (jsonable_encoder + stdlib json), jsonable_encoder + orjson
+and DTOResponse (pydantic TypeAdapter.dump_json), then response throughput of endpoints
+
+run from backend dir:
+    python -m benchmarks.serialization
+
+"""
+import asyncio
+import time
+import timeit
+from typing import List
+
+import httpx
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+
+from src.libs.responses import DTOResponse
+from src.user.dto import PrivateUserDTO
+
+SIZES = (100, 1_000, 10_000)
+REQUESTS = 200
+
+
+def get_items(size: int) -> List[PrivateUserDTO]:
+    return [PrivateUserDTO(name=f"user{i}", login=f"login{i}", email=f"user{i}@example.com") for i in range(size)]
+
+
+def measure_serialization(items: List[PrivateUserDTO]) -> None:
+    cases = {
+        "jsonable_encoder + json": lambda: JSONResponse(jsonable_encoder(items)),
+        "jsonable_encoder + orjson": lambda: ORJSONResponse(jsonable_encoder(items)),
+        "DTOResponse": lambda: DTOResponse(items),
+    }
+    number = max(1, 10_000 // len(items))
+
+    for label, case in cases.items():
+        took = min(timeit.repeat(case, number=number, repeat=5)) / number * 1000
+        print(f"    {label:>26}: {took:.3f} ms")
+
+
+def get_app(items: List[PrivateUserDTO]) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/default/", response_model=List[PrivateUserDTO])
+    async def default():
+        return items
+
+    @app.get("/orjson/", response_model=List[PrivateUserDTO], response_class=ORJSONResponse)
+    async def orjson():
+        return items
+
+    @app.get("/dto/", response_model=List[PrivateUserDTO])
+    async def dto():
+        return DTOResponse(items)
+
+    return app
+
+
+async def measure_throughput(items: List[PrivateUserDTO]) -> None:
+    transport = httpx.ASGITransport(app=get_app(items))
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        for path in ("/default/", "/orjson/", "/dto/"):
+            started_at = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.get(path)
+            print(f"    {path:>26}: {REQUESTS / (time.perf_counter() - started_at):.0f} rps")
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        items = get_items(size)
+        print(f"{size} items, serialization:")
+        measure_serialization(items)
+        print(f"{size} items, throughput:")
+        asyncio.run(measure_throughput(items))
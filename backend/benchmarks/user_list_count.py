@@ -0,0 +1,111 @@
+"""
+
+Benchmark of users list latency with total count strategies on a large table
+
+run from backend dir:
+    python -m benchmarks.user_list_count [postgres_url] [rows]
+
+without url runs on a throwaway SQLite file in temp dir,
+pass postgresql+asyncpg://... url to measure the real thing
+
+the benchmark creates and fills its own tables, on Postgres they are created
+in the dedicated "user_list_count_bench" schema, which is DROPPED (CASCADE) before and after the run,
+tables of the application schema are never touched
+
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# settings require DB env vars on import, benchmark uses its own engine
+for name in ("DB_HOST", "DB_PORT", "DB_NAME", "DB_USER", "DB_PASSWORD"):
+    os.environ.setdefault(name, "benchmark")
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.libs.base_model import Base
+from src.libs.pagination import CountStrategy
+from src.user.models.user import UserModel
+from src.user.models.user_property import UserPropertyModel  # noqa: F401
+from src.user.repositories.user import UserRepository
+
+REPEATS = 50
+BATCH = 10_000
+BENCH_SCHEMA = "user_list_count_bench"
+
+
+async def fill(engine, rows: int) -> None:
+    async with engine.begin() as connection:
+        # search_path points to the bench schema (or SQLite file is fresh), so the tables are our own
+        await connection.run_sync(Base.metadata.create_all)
+
+        for start in range(0, rows, BATCH):
+            await connection.execute(insert(UserModel), [
+                {"name": f"user{i}", "login": f"login{i}", "email": f"user{i}@example.com", "password": "x"}
+                for i in range(start, min(start + BATCH, rows))
+            ])
+
+        if engine.dialect.name == "postgresql":
+            await connection.execute(text("ANALYZE users"))
+
+
+async def measure(session_factory, count_strategy) -> float:
+    started_at = time.perf_counter()
+
+    for _ in range(REPEATS):
+        async with session_factory() as session:
+            repository = UserRepository(session)
+            await repository.get_list(50, 1000)
+            if count_strategy is not None:
+                await repository.count(count_strategy)
+
+    return (time.perf_counter() - started_at) / REPEATS * 1000
+
+
+async def reset_bench_schema(url: str, create: bool) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as connection:
+        await connection.execute(text(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE"))
+        if create:
+            await connection.execute(text(f"CREATE SCHEMA {BENCH_SCHEMA}"))
+    await engine.dispose()
+
+
+async def run(url: str, rows: int, **engine_kwargs) -> None:
+    engine = create_async_engine(url, **engine_kwargs)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    print(f"filling {rows} users ...")
+    await fill(engine, rows)
+
+    for count_strategy in (None, *CountStrategy):
+        label = count_strategy.value if count_strategy else "no count"
+        print(f"{label:>10}: {await measure(session_factory, count_strategy):.2f} ms per page")
+
+    await engine.dispose()
+
+
+async def main(url: str | None, rows: int) -> None:
+    if url is None:
+        with tempfile.TemporaryDirectory() as directory:
+            await run(f"sqlite+aiosqlite:///{directory}/benchmark.db", rows)
+        return
+
+    if not url.startswith("postgresql+asyncpg://"):
+        raise SystemExit("only postgresql+asyncpg:// urls are supported, run without url for SQLite")
+
+    await reset_bench_schema(url, create=True)
+    try:
+        await run(url, rows, connect_args={"server_settings": {"search_path": BENCH_SCHEMA}})
+    finally:
+        await reset_bench_schema(url, create=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(
+        sys.argv[1] if len(sys.argv) > 1 else None,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000,
+    ))
@@ -1,5 +1,10 @@
+import logging
+
 import uvicorn
 
+# uvicorn configures only its own loggers, app loggers (src.*) need root handler
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(name)s - %(message)s")
+
 from src.app import get_app
 
 app = get_app()
@@ -1,19 +1,71 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from src.api.routes import router
+from src.routes import router
+from src.config.database.engine import db_helper
+from src.config.database.migrate import run_auto_migrate
+from src.config.database.settings import settings
+from src.config.settings import app_settings
+from src.libs.admission import AdmissionControlMiddleware
+from src.libs.jobs import job_runner
+from src.libs.process import get_process_uptime
+from src.libs.profiling import ProfilingMiddleware, profiler
+from src.libs.responses import DTOResponse
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    profiler.start(db_helper.engine)
+
+    if settings.db_run_auto_migrate:
+        await run_auto_migrate(db_helper.engine)
+
+    await job_runner.start()
+
+    yield
+
+    await job_runner.stop(app_settings.jobs_drain_timeout)
 
 
 def get_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(default_response_class=DTOResponse, lifespan=lifespan)
+    app.state.healthy_once = False
 
     app.include_router(router)
 
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        route_limits=app_settings.admission_route_limits,
+        default_limit=app_settings.admission_default_limit,
+        max_queue=app_settings.admission_max_queue,
+        max_wait=app_settings.admission_max_wait,
+        rate=app_settings.admission_rate,
+        burst=app_settings.admission_burst,
+    )
+    # added last to be outermost, so rejected requests are counted as well
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
     @app.get("/")
     def root():
         return {"message": "Hello World"}
 
     @app.get("/health")
     def health():
+        if not app.state.healthy_once:
+            app.state.healthy_once = True
+            logger.info("First healthy /health in %.3fs after process start", get_process_uptime())
+
         return {"message": "healthy"}
 
+    @app.get("/metrics")
+    def metrics():
+        result = {"jobs": job_runner.metrics()}
+        if profiler.enabled:
+            result["profiling"] = profiler.metrics()
+        return result
+
     return app
\ No newline at end of file
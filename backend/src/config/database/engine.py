@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from src.config.database.settings import settings
+from src.libs.profiling import profiler
 
 
 class DatabaseHelper:
@@ -29,23 +30,11 @@ class DatabaseHelper:
             scopefunc=current_task
         )
 
-    @asynccontextmanager
-    async def get_db_session(self):
-        from sqlalchemy import exc
-
-        session: AsyncSession = self.session_factory()
-        try:
-            yield session
-        except exc.SQLAlchemyError:
-            await session.rollback()
-            raise
-        finally:
-            await session.close()
-
     async def get_session(self):
         from sqlalchemy import exc
 
         session: AsyncSession = self.session_factory()
+        profiler.session_opened()
         try:
             yield session
         except exc.SQLAlchemyError:
@@ -53,6 +42,10 @@ class DatabaseHelper:
             raise
         finally:
             await session.close()
+            profiler.session_closed()
+
+    # same session lifecycle for usage outside of FastAPI dependencies (async with)
+    get_db_session = asynccontextmanager(get_session)
 
 
 db_helper = DatabaseHelper(settings.database_url, settings.db_echo_log)
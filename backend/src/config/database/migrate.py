@@ -0,0 +1,152 @@
+import hashlib
+import logging
+import time
+from typing import List, Optional
+
+from sqlalchemy import Column, Connection, DateTime, MetaData, String, Table, delete, func, insert, inspect, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.libs.base_model import Base
+from src.libs.exceptions import SchemaMismatch
+# models have to be imported to be registered in Base.metadata
+from src.user.models.user import UserModel  # noqa: F401
+from src.user.models.user_property import UserPropertyModel  # noqa: F401
+
+logger = logging.getLogger(__name__)
+
+# any constant bigint, same for all workers
+MIGRATION_LOCK_KEY = 7_364_015_286
+
+# kept out of Base.metadata, so it does not affect the fingerprint itself
+fingerprint_table = Table(
+    "schema_fingerprint",
+    MetaData(),
+    Column("fingerprint", String(64), primary_key=True),
+    Column("migrated_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def get_schema_fingerprint(engine: AsyncEngine) -> str:
+    """
+    Get hash of the DDL generated from Base.metadata for engine dialect
+
+    Args:
+        engine: AsyncEngine
+
+    Returns:
+        str, sha256 hex digest
+    """
+    digest = hashlib.sha256()
+
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=engine.dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            digest.update(str(CreateIndex(index).compile(dialect=engine.dialect)).encode())
+
+    return digest.hexdigest()
+
+
+def _get_stored_fingerprint(connection: Connection) -> Optional[str]:
+    if not inspect(connection).has_table(fingerprint_table.name):
+        return None
+    return connection.execute(select(fingerprint_table.c.fingerprint)).scalar_one_or_none()
+
+
+def _get_columns_diff(connection: Connection) -> List[str]:
+    """
+    Compare reflected columns of Base.metadata tables with the models
+
+    Args:
+        connection: Connection
+
+    Returns:
+        List of differences, empty if columns match
+    """
+    inspector = inspect(connection)
+    dialect = connection.dialect
+    diff = []
+
+    for table in Base.metadata.sorted_tables:
+        reflected = {column["name"]: column for column in inspector.get_columns(table.name)}
+
+        for column in table.columns:
+            existing = reflected.pop(column.name, None)
+            expected_type = column.type.compile(dialect=dialect)
+
+            if existing is None:
+                diff.append(f"{table.name}.{column.name} is missing")
+            elif existing["type"].compile(dialect=dialect) != expected_type:
+                diff.append(f"{table.name}.{column.name} type is {existing['type']}, expected {expected_type}")
+            elif existing["nullable"] != column.nullable:
+                diff.append(f"{table.name}.{column.name} nullable is {existing['nullable']}, expected {column.nullable}")
+
+        diff.extend(f"{table.name}.{name} is not in the model" for name in reflected)
+
+    return diff
+
+
+def _migrate(connection: Connection, fingerprint: str) -> None:
+    """
+    Create missing tables and indexes, store fingerprint if the schema matches the models after it
+
+    Raises:
+        SchemaMismatch: if columns differ from the models and have to be migrated manually
+    """
+    # create_all creates only missing tables and indexes, changed columns needs manual migration
+    Base.metadata.create_all(connection)
+
+    diff = _get_columns_diff(connection)
+    if diff:
+        # transaction is rolled back and startup aborted, app must not serve requests on wrong schema
+        raise SchemaMismatch(f"Database schema does not match the models, migrate it manually: {'; '.join(diff)}")
+
+    fingerprint_table.create(connection, checkfirst=True)
+
+    connection.execute(delete(fingerprint_table))
+    connection.execute(insert(fingerprint_table).values(fingerprint=fingerprint))
+
+
+async def run_auto_migrate(engine: AsyncEngine) -> None:
+    """
+    Create database schema from Base.metadata if it was changed since the last run
+
+    boot with unchanged schema costs one query for stored fingerprint,
+    otherwise only one worker migrates under Postgres advisory lock, others wait for it
+    and find the fingerprint already updated
+
+    Args:
+        engine: AsyncEngine
+
+    Raises:
+        SchemaMismatch: if columns differ from the models, aborts the startup
+    """
+    fingerprint = get_schema_fingerprint(engine)
+
+    try:
+        async with engine.connect() as connection:
+            stored = (await connection.execute(select(fingerprint_table.c.fingerprint))).scalar_one_or_none()
+    except DBAPIError:
+        # fingerprint table does not exist yet
+        stored = None
+
+    if stored == fingerprint:
+        logger.info("Database schema is up to date, fingerprint %s", fingerprint[:12])
+        return
+
+    started_at = time.monotonic()
+
+    async with engine.begin() as connection:
+        if engine.dialect.name == "postgresql":
+            # released on transaction end
+            await connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+
+        # schema could be migrated by other worker while we waited for the lock
+        if await connection.run_sync(_get_stored_fingerprint) == fingerprint:
+            logger.info("Database schema was migrated by other worker, waited %.3fs", time.monotonic() - started_at)
+            return
+
+        await connection.run_sync(_migrate, fingerprint)
+
+    logger.info("Database schema migrated in %.3fs, fingerprint %s", time.monotonic() - started_at, fingerprint[:12])
@@ -15,6 +15,8 @@ class Settings(BaseSettings):
     db_echo_log: bool = Field(False, alias="DB_ECHO_LOG")
     # run auto-migrate
     db_run_auto_migrate: bool = Field(False, alias="DB_RUN_AUTO_MIGRATE")
+    # seconds before cached total counts are refreshed
+    db_count_cache_ttl: float = Field(60, alias="DB_COUNT_CACHE_TTL")
 
     @property
     def database_url(self) -> PostgresDsn:
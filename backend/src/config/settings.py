@@ -0,0 +1,32 @@
+from typing import Dict
+
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+
+class AppSettings(BaseSettings):
+    # admission control, concurrency limits by route prefix e.g. {"/users/": 20}
+    admission_route_limits: Dict[str, int] = Field({}, alias="ADMISSION_ROUTE_LIMITS")
+    admission_default_limit: int = Field(100, alias="ADMISSION_DEFAULT_LIMIT")
+    admission_max_queue: int = Field(100, alias="ADMISSION_MAX_QUEUE")
+    # max estimated wait in queue (seconds) before fail fast with 503
+    admission_max_wait: float = Field(1.0, alias="ADMISSION_MAX_WAIT")
+    # rate limit per client, requests per second and burst size
+    admission_rate: float = Field(20, alias="ADMISSION_RATE")
+    admission_burst: float = Field(40, alias="ADMISSION_BURST")
+    # background jobs
+    jobs_workers: int = Field(4, alias="JOBS_WORKERS")
+    jobs_queue_size: int = Field(1000, alias="JOBS_QUEUE_SIZE")
+    jobs_max_retries: int = Field(3, alias="JOBS_MAX_RETRIES")
+    jobs_retry_backoff: float = Field(1.0, alias="JOBS_RETRY_BACKOFF")
+    # seconds to wait for queued jobs on shutdown
+    jobs_drain_timeout: float = Field(10.0, alias="JOBS_DRAIN_TIMEOUT")
+    # SQLite file to keep queued jobs between restarts, in memory only if empty
+    jobs_sqlite_path: str = Field("", alias="JOBS_SQLITE_PATH")
+    # seconds before jobs claimed by crashed process can be run by other one
+    jobs_claim_lease: float = Field(3600, alias="JOBS_CLAIM_LEASE")
+    # tracemalloc, sessions and connections counters, slows down requests
+    profiling_enabled: bool = Field(False, alias="PROFILING_ENABLED")
+
+
+app_settings = AppSettings()
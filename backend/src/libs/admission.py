@@ -0,0 +1,181 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter
+
+    :param rate: tokens added per second
+    :param capacity: max tokens (burst size)
+    """
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def acquire(self) -> float:
+        """
+        Take one token from the bucket
+
+        Returns:
+            0 if token was taken, otherwise seconds to wait for the next token
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0
+
+        return (1 - self.tokens) / self.rate
+
+
+class ConcurrencyLimiter:
+    """
+    Concurrency limit for group of routes with bounded waiting queue
+
+    requests are rejected instead of queued when queue is full,
+    or when estimated wait (by average request latency) is longer than max_wait
+    """
+    def __init__(self, limit: int, max_queue: int, max_wait: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self.waiting = 0
+        self.avg_latency = 0.0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    def estimated_wait(self) -> float:
+        if self.active < self.limit:
+            return 0
+        return (self.waiting + 1) * self.avg_latency / self.limit
+
+    def should_reject(self) -> bool:
+        if self.active < self.limit:
+            return False
+        return self.waiting >= self.max_queue or self.estimated_wait() > self.max_wait
+
+    async def acquire(self) -> None:
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.active += 1
+
+    def release(self, latency: float) -> None:
+        self.active -= 1
+        self._semaphore.release()
+        # exponential moving average, recent requests matters more
+        self.avg_latency = latency if not self.avg_latency else self.avg_latency * 0.9 + latency * 0.1
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware to shed load instead of queueing requests
+
+    - rate limit per client address by token bucket, responds 429
+    - concurrency limit per route prefix with bounded queue, responds 503
+
+    both responses have Retry-After header, exempt paths (health, metrics) are never limited
+
+    :param route_limits: concurrency limits by path prefix, longest prefix wins
+    :param default_limit: concurrency limit for all other routes together
+    """
+    def __init__(
+            self,
+            app: ASGIApp,
+            route_limits: Optional[Dict[str, int]] = None,
+            default_limit: int = 100,
+            max_queue: int = 100,
+            max_wait: float = 1.0,
+            rate: float = 20,
+            burst: float = 40,
+            exempt_paths: Iterable[str] = ("/health", "/metrics"),
+            max_clients: int = 10000,
+    ):
+        self.app = app
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self.exempt_paths = tuple(exempt_paths)
+
+        self.limiters: Dict[str, ConcurrencyLimiter] = {
+            prefix: ConcurrencyLimiter(limit, max_queue, max_wait)
+            for prefix, limit in (route_limits or {}).items()
+        }
+        self.default_limiter = ConcurrencyLimiter(default_limit, max_queue, max_wait)
+        # LRU order, most recently seen client is the last
+        self.buckets: OrderedDict[str, TokenBucket] = OrderedDict()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._is_exempt(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self._get_bucket(self._client_key(scope)).acquire()
+        if retry_after:
+            await self._reject(429, "Too many requests", retry_after, scope, receive, send)
+            return
+
+        limiter = self._get_limiter(scope["path"])
+        if limiter.should_reject():
+            await self._reject(503, "Service overloaded", limiter.estimated_wait(), scope, receive, send)
+            return
+
+        await limiter.acquire()
+        started_at = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release(time.monotonic() - started_at)
+
+    def _is_exempt(self, path: str) -> bool:
+        return any(path == exempt or path.startswith(exempt + "/") for exempt in self.exempt_paths)
+
+    @staticmethod
+    def _client_key(scope: Scope) -> str:
+        # client address only, unverified credentials would let anyone get a fresh bucket per request
+        client: Optional[Tuple[str, int]] = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _get_bucket(self, key: str) -> TokenBucket:
+        bucket = self.buckets.get(key)
+
+        if bucket is not None:
+            self.buckets.move_to_end(key)
+            return bucket
+
+        # hard cap, least recently seen client loses its bucket (and gets a full one later)
+        if len(self.buckets) >= self.max_clients:
+            self.buckets.popitem(last=False)
+
+        bucket = self.buckets[key] = TokenBucket(self.rate, self.burst)
+        return bucket
+
+    def _get_limiter(self, path: str) -> ConcurrencyLimiter:
+        matched = [prefix for prefix in self.limiters if path.startswith(prefix)]
+
+        if not matched:
+            return self.default_limiter
+
+        return self.limiters[max(matched, key=len)]
+
+    @staticmethod
+    async def _reject(status_code: int, message: str, retry_after: float, scope: Scope, receive: Receive, send: Send):
+        response = JSONResponse(
+            {"message": message},
+            status_code=status_code,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+        )
+        await response(scope, receive, send)
@@ -10,4 +10,16 @@ class NotFound(Exception):
     pass
 
 class PaginationError(Exception):
-    pass
\ No newline at end of file
+    pass
+
+class JobQueueFull(Exception):
+    # Background jobs queue reached its size limit
+    pass
+
+class ResourceLeak(Exception):
+    # Sessions, connections or memory grow over requests
+    pass
+
+class SchemaMismatch(Exception):
+    # Database schema differs from the models and can't be migrated automatically
+    pass
@@ -0,0 +1,300 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from src.config.settings import app_settings
+from src.libs.exceptions import JobQueueFull
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+class JobDTO(BaseModel):
+    id: str = Field(default_factory=lambda: uuid.uuid4().hex)
+    name: str
+    kwargs: Dict[str, Any] = {}
+    attempts: int = 0
+    enqueued_at: float = Field(default_factory=time.time)
+
+
+class MemoryJobBackend:
+    """Jobs backend without persistence, queued jobs are lost on restart"""
+    async def save(self, job: JobDTO) -> None:
+        pass
+
+    async def delete(self, job_id: str) -> None:
+        pass
+
+    async def load_pending(self) -> List[JobDTO]:
+        return []
+
+    async def release(self) -> None:
+        pass
+
+
+class SQLiteJobBackend:
+    """
+    Jobs backend to keep queued jobs between restarts in local SQLite file
+
+    jobs are deleted when done or finally failed, so everything left in the file is queued again,
+    every job row is claimed by the process which runs it, so processes sharing the file
+    (several workers, rolling deploy) never run the same job twice
+
+    claims are released on graceful shutdown, claims of crashed processes expire after lease
+
+    :param path: SQLite file path
+    :param lease: seconds before the claim of not finished job expires
+    """
+    def __init__(self, path: str, lease: float = 3600):
+        self.path = path
+        self.lease = lease
+        self.owner = uuid.uuid4().hex
+        self._execute(
+            "CREATE TABLE IF NOT EXISTS jobs "
+            "(id TEXT PRIMARY KEY, data TEXT NOT NULL, claimed_by TEXT, claimed_at REAL)"
+        )
+
+    def _execute(self, *statements: Tuple[str, tuple] | str) -> List[tuple]:
+        """Execute statements in one transaction, returns rows of the last one"""
+        with closing(sqlite3.connect(self.path)) as connection, connection:
+            rows = []
+            for statement in statements:
+                query, params = (statement, ()) if isinstance(statement, str) else statement
+                rows = connection.execute(query, params).fetchall()
+            return rows
+
+    async def save(self, job: JobDTO) -> None:
+        await asyncio.to_thread(self._execute, (
+            "INSERT OR REPLACE INTO jobs (id, data, claimed_by, claimed_at) VALUES (?, ?, ?, ?)",
+            (job.id, job.model_dump_json(), self.owner, time.time()),
+        ))
+
+    async def delete(self, job_id: str) -> None:
+        await asyncio.to_thread(self._execute, ("DELETE FROM jobs WHERE id = ?", (job_id,)))
+
+    async def load_pending(self) -> List[JobDTO]:
+        """Claim unclaimed and expired jobs for this process and return them"""
+        rows = await asyncio.to_thread(
+            self._execute,
+            (
+                "UPDATE jobs SET claimed_by = ?, claimed_at = ? WHERE claimed_by IS NULL OR claimed_at < ?",
+                (self.owner, time.time(), time.time() - self.lease),
+            ),
+            ("SELECT data FROM jobs WHERE claimed_by = ?", (self.owner,)),
+        )
+        return [JobDTO(**json.loads(data)) for data, in rows]
+
+    async def release(self) -> None:
+        """Release claims of not finished jobs, so other process can run them"""
+        await asyncio.to_thread(self._execute, (
+            "UPDATE jobs SET claimed_by = NULL, claimed_at = NULL WHERE claimed_by = ?", (self.owner,)
+        ))
+
+
+class JobRunner:
+    """
+    In-process background jobs runner with bounded queue
+
+    usage:
+        @job_runner.job("send_welcome_email")
+        async def send_welcome_email(user_id: int): ...
+
+        await job_runner.enqueue("send_welcome_email", user_id=user.id)
+
+    job kwargs have to be JSON serializable to be stored by persistent backend
+
+    :param workers: number of concurrent worker tasks
+    :param queue_size: max queued jobs, enqueue raises JobQueueFull above it
+    :param max_retries: retries of failed job, with exponential backoff
+    :param retry_backoff: delay before the first retry in seconds, doubles after each one
+    """
+    def __init__(
+            self,
+            backend=None,
+            workers: int = 4,
+            queue_size: int = 1000,
+            max_retries: int = 3,
+            retry_backoff: float = 1.0,
+    ):
+        self.backend = backend or MemoryJobBackend()
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+
+        self.queue_size = queue_size
+
+        self.handlers: Dict[str, JobHandler] = {}
+        # created in start(), queue is bound to the event loop it is used in
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._retries: Dict[str, asyncio.TimerHandle] = {}
+        self._accepting = False
+
+        self._processed = 0
+        self._failed = 0
+        self._latency_total = 0.0
+        self._latency_max = 0.0
+
+    def job(self, name: str) -> Callable[[JobHandler], JobHandler]:
+        """Decorator to register job handler by name"""
+        def decorator(handler: JobHandler) -> JobHandler:
+            self.handlers[name] = handler
+            return handler
+        return decorator
+
+    async def enqueue(self, name: str, **kwargs) -> JobDTO:
+        """
+        Put job into the queue without waiting for its execution
+
+        Args:
+            name: registered job name
+            kwargs: job handler arguments
+
+        Returns:
+            JobDTO
+
+        Raises:
+            JobQueueFull: if queue is full or runner is not started (or already stopped)
+        """
+        if name not in self.handlers:
+            raise KeyError(f"Job {name} is not registered")
+
+        if not self._accepting or self._queue.full():
+            raise JobQueueFull(f"Job {name} can not be queued")
+
+        job = JobDTO(name=name, kwargs=kwargs)
+        # saved before put, so worker can not finish (and delete) the job before it is saved
+        await self.backend.save(job)
+
+        try:
+            # queue could be filled by concurrent enqueues while backend was saving
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            await self.backend.delete(job.id)
+            raise JobQueueFull(f"Job {name} can not be queued")
+
+        return job
+
+    async def start(self) -> None:
+        """Start workers and queue again the jobs left in backend by previous run"""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+
+        for job in await self.backend.load_pending():
+            if self._queue.full():
+                logger.warning("Job queue is full, job %s stays in backend until next start", job.id)
+                continue
+            self._queue.put_nowait(job)
+
+        self._accepting = True
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, timeout: float) -> None:
+        """
+        Stop accepting new jobs and wait for the queued ones up to timeout
+
+        scheduled retries are cancelled, unfinished jobs (retries included)
+        stay in persistent backend and will be run on the next start
+        """
+        self._accepting = False
+
+        if self._queue is None:
+            return
+
+        for handle in self._retries.values():
+            handle.cancel()
+        if self._retries:
+            logger.warning("%s scheduled job retries were cancelled", len(self._retries))
+        self._retries.clear()
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Job queue was not drained in %ss, %s jobs left", timeout, self._queue.qsize())
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        await self.backend.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "retries_scheduled": len(self._retries),
+            "processed": self._processed,
+            "failed": self._failed,
+            "latency_avg": self._latency_total / self._processed if self._processed else 0.0,
+            "latency_max": self._latency_max,
+        }
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: JobDTO) -> None:
+        handler: Optional[JobHandler] = self.handlers.get(job.name)
+
+        try:
+            if handler is None:
+                raise KeyError(f"Job {job.name} is not registered")
+            await handler(**job.kwargs)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            job.attempts += 1
+            if handler is None or job.attempts > self.max_retries:
+                logger.exception("Job %s %s failed after %s attempts", job.name, job.id, job.attempts)
+                self._failed += 1
+                await self.backend.delete(job.id)
+                return
+
+            await self.backend.save(job)
+            # worker is free right away, job is put back into the queue after backoff
+            self._retries[job.id] = asyncio.get_running_loop().call_later(
+                self.retry_backoff * 2 ** (job.attempts - 1), self._retry, job
+            )
+            return
+
+        await self.backend.delete(job.id)
+
+        # latency of succeeded jobs only, failed ones are counted separately
+        latency = time.time() - job.enqueued_at
+        self._processed += 1
+        self._latency_total += latency
+        self._latency_max = max(self._latency_max, latency)
+
+    def _retry(self, job: JobDTO) -> None:
+        self._retries.pop(job.id, None)
+
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            # job is saved in backend, try again after the same delay
+            self._retries[job.id] = asyncio.get_running_loop().call_later(
+                self.retry_backoff * 2 ** (job.attempts - 1), self._retry, job
+            )
+
+
+job_runner = JobRunner(
+    backend=(
+        SQLiteJobBackend(app_settings.jobs_sqlite_path, app_settings.jobs_claim_lease)
+        if app_settings.jobs_sqlite_path else None
+    ),
+    workers=app_settings.jobs_workers,
+    queue_size=app_settings.jobs_queue_size,
+    max_retries=app_settings.jobs_max_retries,
+    retry_backoff=app_settings.jobs_retry_backoff,
+)
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class CountStrategy(str, Enum):
+    """
+    Strategy used to calculate total rows count for paginated listings
+
+    exact - COUNT(*) over the whole table, always correct, full scan on Postgres
+    estimated - planner statistics (pg_class.reltuples or EXPLAIN row estimate), constant time, approximate
+    cached - exact count cached in process and refreshed in background after ttl
+    """
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    CACHED = "cached"
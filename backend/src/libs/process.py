@@ -0,0 +1,28 @@
+import os
+import time
+
+# fallback for platforms without /proc, taken when this module is imported
+_IMPORTED_AT = time.monotonic()
+
+
+def get_process_uptime() -> float:
+    """
+    Get seconds passed since the current process start
+
+    read from /proc (interpreter boot and imports included),
+    on other platforms falls back to the time since this module was imported
+
+    Returns:
+        float
+    """
+    try:
+        with open("/proc/self/stat") as stat_file:
+            # process name could contain spaces and parentheses, fields are counted after the last ")"
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime") as uptime_file:
+            system_uptime = float(uptime_file.read().split()[0])
+    except (OSError, IndexError, ValueError):
+        return time.monotonic() - _IMPORTED_AT
+
+    # starttime is the 22nd field of stat, in clock ticks since boot
+    return system_uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
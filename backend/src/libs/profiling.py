@@ -0,0 +1,218 @@
+import asyncio
+import functools
+import time
+import tracemalloc
+from contextvars import ContextVar
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.config.settings import app_settings
+from src.libs.exceptions import ResourceLeak
+
+# time when endpoint of the current request was called, see ProfiledRoute
+_endpoint_called_at: ContextVar[List[Optional[float]]] = ContextVar("endpoint_called_at")
+
+
+class ProfilingSnapshotDTO(BaseModel):
+    requests: int
+    sessions_opened: int
+    sessions_closed: int
+    connections_checked_out: int
+    traced_memory: int
+    traced_memory_peak: int
+    # net traced memory growth per request (clipped at 0), not the total allocations
+    avg_request_memory_growth: float
+    avg_dependencies_time: float
+
+
+class Profiler:
+    """
+    Counters of sessions, pool connections and memory growth per request
+
+    does nothing unless enabled, so hooks can stay in place in production code
+
+    usage in soak test:
+        baseline = profiler.snapshot()
+        ... N thousand requests ...
+        profiler.check_growth(baseline, max_memory_growth=1024 * 1024)
+    """
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+
+        self.requests = 0
+        self.sessions_opened = 0
+        self.sessions_closed = 0
+        self.connections_checked_out = 0
+        self.memory_growth_total = 0
+        self.profiled_requests = 0
+        self.dependencies_time = 0.0
+
+    def start(self, engine: AsyncEngine) -> None:
+        """Start memory tracing and listen engine pool checkouts"""
+        if not self.enabled:
+            return
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        pool = engine.sync_engine.pool
+        # lifespan could run several times in one process (e.g. tests)
+        if not event.contains(pool, "checkout", self._on_checkout):
+            event.listen(pool, "checkout", self._on_checkout)
+            event.listen(pool, "checkin", self._on_checkin)
+
+    def stop(self) -> None:
+        """Stop memory tracing, counters are kept"""
+        self.enabled = False
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    def session_opened(self) -> None:
+        if self.enabled:
+            self.sessions_opened += 1
+
+    def session_closed(self) -> None:
+        if self.enabled:
+            self.sessions_closed += 1
+
+    def add_dependencies_time(self, elapsed: float) -> None:
+        self.profiled_requests += 1
+        self.dependencies_time += elapsed
+
+    def snapshot(self) -> ProfilingSnapshotDTO:
+        traced, peak = tracemalloc.get_traced_memory()
+
+        return ProfilingSnapshotDTO(
+            requests=self.requests,
+            sessions_opened=self.sessions_opened,
+            sessions_closed=self.sessions_closed,
+            connections_checked_out=self.connections_checked_out,
+            traced_memory=traced,
+            traced_memory_peak=peak,
+            avg_request_memory_growth=self.memory_growth_total / self.requests if self.requests else 0.0,
+            avg_dependencies_time=(
+                self.dependencies_time / self.profiled_requests if self.profiled_requests else 0.0
+            ),
+        )
+
+    def check_growth(self, baseline: ProfilingSnapshotDTO, max_memory_growth: int) -> None:
+        """
+        Check that nothing leaked since baseline snapshot, call when there is no requests in flight
+
+        Args:
+            baseline: snapshot taken before the requests
+            max_memory_growth: allowed traced memory growth in bytes
+
+        Raises:
+            ResourceLeak: if sessions left open, connections left checked out or memory grew too much
+        """
+        current = self.snapshot()
+        open_sessions = current.sessions_opened - current.sessions_closed
+
+        if open_sessions > baseline.sessions_opened - baseline.sessions_closed:
+            raise ResourceLeak(f"{open_sessions} sessions left open after {current.requests} requests")
+
+        if current.connections_checked_out > baseline.connections_checked_out:
+            raise ResourceLeak(f"{current.connections_checked_out} connections left checked out")
+
+        memory_growth = current.traced_memory - baseline.traced_memory
+        if memory_growth > max_memory_growth:
+            raise ResourceLeak(
+                f"Memory grew by {memory_growth} bytes over {current.requests - baseline.requests} requests"
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        return self.snapshot().model_dump()
+
+    def _on_checkout(self, *args) -> None:
+        self.connections_checked_out += 1
+
+    def _on_checkin(self, *args) -> None:
+        self.connections_checked_out -= 1
+
+
+def _mark_endpoint_called() -> None:
+    called_at = _endpoint_called_at.get(None)
+    if called_at is not None:
+        called_at[0] = time.perf_counter()
+
+
+class ProfiledRoute(APIRoute):
+    """
+    Route class to measure per request dependencies resolution time
+
+    time from the route handler start to the endpoint call, so it includes Depends graph solving,
+    request parsing and threadpool hops of sync dependencies, use for routers with dependencies:
+        router = APIRouter(route_class=ProfiledRoute)
+    """
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        endpoint = self.dependant.call
+
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def profiled_endpoint(*args, **kwargs):
+                _mark_endpoint_called()
+                return await endpoint(*args, **kwargs)
+        else:
+            # sync endpoint runs in threadpool, context is copied there, but the list object is shared
+            @functools.wraps(endpoint)
+            def profiled_endpoint(*args, **kwargs):
+                _mark_endpoint_called()
+                return endpoint(*args, **kwargs)
+
+        self.dependant.call = profiled_endpoint
+        handler = super().get_route_handler()
+
+        async def profiled_handler(request: Request) -> Response:
+            # checked per request, so profiling can be switched on after routes are created
+            if not profiler.enabled:
+                return await handler(request)
+
+            called_at: List[Optional[float]] = [None]
+            _endpoint_called_at.set(called_at)
+            started_at = time.perf_counter()
+
+            response = await handler(request)
+
+            # accumulated in the event loop thread only, no lock needed
+            if called_at[0] is not None:
+                profiler.add_dependencies_time(called_at[0] - started_at)
+
+            return response
+
+        return profiled_handler
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware to count requests and traced memory growth over them
+
+    growth is the net change of traced memory (memory freed by the request is subtracted),
+    it shows what requests keep alive, not how much they allocate,
+    memory of concurrent requests is mixed, so run profiling with sequential load
+    """
+    def __init__(self, app: ASGIApp, profiler: Profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.profiler.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            after, _ = tracemalloc.get_traced_memory()
+            self.profiler.requests += 1
+            self.profiler.memory_growth_total += max(0, after - before)
+
+
+profiler = Profiler(app_settings.profiling_enabled)
@@ -0,0 +1,36 @@
+from functools import lru_cache
+from typing import Any, List
+
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _get_adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+class DTOResponse(ORJSONResponse):
+    """
+    JSON response for DTOs and lists of DTOs
+
+    DTOs serialized straight to bytes by pydantic (in Rust) once,
+    without jsonable_encoder walking every field to python dicts first
+
+    works only for DTOResponse(dto) returned from endpoint, FastAPI returns such response as is,
+    DTOs returned as plain values are still converted by jsonable_encoder to dicts,
+    which are rendered by orjson then
+    """
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return _get_adapter(type(content)).dump_json(content)
+
+        if isinstance(content, list) and content and isinstance(content[0], BaseModel):
+            item_type = type(content[0])
+            if all(type(item) is item_type for item in content):
+                return _get_adapter(List[item_type]).dump_json(content)
+
+            # mixed list or subclasses, every item is serialized by its own runtime type
+            return _get_adapter(List[Any]).dump_json(content)
+
+        return super().render(content)
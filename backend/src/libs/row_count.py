@@ -0,0 +1,154 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Optional, Set, Type
+
+from sqlalchemy import Select, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database.settings import settings
+from src.libs.base_model import Base
+
+logger = logging.getLogger(__name__)
+
+# below this planner estimate the exact count is cheap enough and avoids planner default guesses
+EXACT_COUNT_THRESHOLD = 10_000
+
+
+async def exact_count(session: AsyncSession, model: Type[Base]) -> int:
+    """
+    Count all rows of the model table
+
+    Args:
+        session: AsyncSession
+        model: SqlAlchemy model
+
+    Returns:
+        int
+    """
+    stmt = select(func.count()).select_from(model)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def explain_count(session: AsyncSession, stmt: Select) -> int:
+    """
+    Get rows count estimation of the select statement from Postgres EXPLAIN,
+    works for filtered statements as well
+
+    Args:
+        session: AsyncSession
+        stmt: Select statement
+
+    Returns:
+        int
+    """
+    compiled = stmt.compile(dialect=session.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))).scalar_one()
+    # asyncpg returns json columns as str
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def estimated_count(session: AsyncSession, model: Type[Base]) -> Optional[int]:
+    """
+    Get rows count estimation of the model table from planner statistics
+
+    uses pg_class.reltuples, or EXPLAIN row estimate when the table was never analyzed,
+    works only on Postgres, for other dialects (e.g. SQLite for local runs) returns None
+
+    Args:
+        session: AsyncSession
+        model: SqlAlchemy model
+
+    Returns:
+        int or None if the estimation is unreliable, so exact count should be used
+    """
+    if session.bind.dialect.name != "postgresql":
+        return None
+
+    stmt = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)")
+    reltuples = (await session.execute(stmt, {"table_name": model.__tablename__})).scalar_one_or_none()
+
+    if reltuples is None:
+        return None
+
+    # reltuples is -1 (PG 14+) or 0 (older versions) until the table was vacuumed or analyzed,
+    # planner estimates such table by its physical size
+    if reltuples <= 0:
+        reltuples = await explain_count(session, select(model))
+
+    if reltuples < EXACT_COUNT_THRESHOLD:
+        return None
+
+    return reltuples
+
+
+class CountCache:
+    """
+    In-process cache of exact tables rows counts
+
+    stale values are returned as is while fresh count is calculated in background task,
+    so only the very first call per table pays for the COUNT(*)
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._values: Dict[str, int] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._refreshing: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def get(self, session: AsyncSession, model: Type[Base]) -> int:
+        """
+        Get cached rows count of the model table
+
+        Args:
+            session: AsyncSession, used only when there is no cached value yet
+            model: SqlAlchemy model
+
+        Returns:
+            int
+        """
+        table_name = model.__tablename__
+
+        if table_name not in self._values:
+            self._set(table_name, await exact_count(session, model))
+        elif time.monotonic() - self._updated_at[table_name] > self.ttl:
+            self._schedule_refresh(model)
+
+        return self._values[table_name]
+
+    def _set(self, table_name: str, value: int) -> None:
+        self._values[table_name] = value
+        self._updated_at[table_name] = time.monotonic()
+
+    def _schedule_refresh(self, model: Type[Base]) -> None:
+        if model.__tablename__ in self._refreshing:
+            return
+
+        self._refreshing.add(model.__tablename__)
+        task = asyncio.create_task(self._refresh(model))
+        # keep reference to the task, event loop holds only weak references
+        self._tasks.add(task)
+        task.add_done_callback(self._on_refreshed)
+
+    def _on_refreshed(self, task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Count cache refresh failed, stale value is kept", exc_info=task.exception())
+
+    async def _refresh(self, model: Type[Base]) -> None:
+        from src.config.database.engine import db_helper
+
+        try:
+            # request session could be already closed, so use own one
+            async with db_helper.get_db_session() as session:
+                self._set(model.__tablename__, await exact_count(session, model))
+        finally:
+            self._refreshing.discard(model.__tablename__)
+
+
+count_cache = CountCache(settings.db_count_cache_ttl)
@@ -1,6 +1,6 @@
 from fastapi import Depends
 from typing import Annotated
 
-from src.apps.user.service import UserService
+from src.user.service import UserService
 
 IUserService = Annotated[UserService, Depends()]
\ No newline at end of file
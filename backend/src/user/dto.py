@@ -1,5 +1,7 @@
 from pydantic import BaseModel, EmailStr, constr
-from typing import Optional
+from typing import Optional, List
+
+from src.libs.pagination import CountStrategy
 
 class UserDTO(BaseModel):
     id: Optional[int]
@@ -11,6 +13,11 @@ class UserDTO(BaseModel):
 class PublicUserDTO(BaseModel):
     name: constr(max_length=30)
 
+class UserListDTO(BaseModel):
+    items: List[PublicUserDTO]
+    total: int
+    count_strategy: CountStrategy
+
 class PrivateUserDTO(BaseModel):
     name: constr(max_length=30)
     login: constr(max_length=50)
@@ -1,8 +1,10 @@
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 from sqlalchemy import select, update, delete
 from sqlalchemy.exc import IntegrityError
 
+from src.libs.pagination import CountStrategy
+from src.libs.row_count import count_cache, estimated_count, exact_count
 from src.user.exceptions import UserAlreadyExist, UserNotFound
 from src.config.database.session import ISession
 from src.user.models.user import UserModel
@@ -33,7 +35,7 @@ class UserRepository:
         try:
             await self.session.commit()
         except IntegrityError:
-            self.session.rollback()
+            await self.session.rollback()
             raise UserAlreadyExist(f"User with same login or email already exists. User: {UserDTO}")
 
         await self.session.refresh(instance)
@@ -105,6 +107,29 @@ class UserRepository:
 
         return [self._get_dto(row) for row in results]
 
+    async def count(self, strategy: CountStrategy = CountStrategy.EXACT) -> Tuple[int, CountStrategy]:
+        """
+        Get total users count by strategy
+
+        estimated strategy falls back to exact count when there is no planner statistics
+        (e.g. SQLite or never analyzed table)
+
+        Args:
+            strategy: CountStrategy
+
+        Returns:
+            Tuple of users count and strategy that was actually used
+        """
+        if strategy == CountStrategy.CACHED:
+            return await count_cache.get(self.session, UserModel), strategy
+
+        if strategy == CountStrategy.ESTIMATED:
+            result = await estimated_count(self.session, UserModel)
+            if result is not None:
+                return result, strategy
+
+        return await exact_count(self.session, UserModel), CountStrategy.EXACT
+
     async def update(self, dto: UpdateUserDTO, pk: int) -> UserDTO:
         """
         Update user by dto and primary key
@@ -30,9 +30,9 @@ class UserPropertyRepository:
         self.session.add(instance)
 
         try:
-            self.session.commit()
+            await self.session.commit()
         except IntegrityError:
-            self.session.rollback()
+            await self.session.rollback()
             raise UserPropertyCreationError(f"Something went wrong while creating the property: {user_property}")
 
         await self.session.refresh(instance)
@@ -0,0 +1,25 @@
+from typing import Literal
+
+from fastapi import APIRouter, Query
+
+from src.libs.pagination import CountStrategy
+from src.libs.profiling import ProfiledRoute
+from src.libs.responses import DTOResponse
+from src.user.dependencies.service import IUserService
+from src.user.dto import UserListDTO
+
+router = APIRouter(prefix="/users", tags=["users"], route_class=ProfiledRoute)
+
+MAX_PAGE_SIZE = 100
+
+
+@router.get("/", response_model=UserListDTO)
+async def get_users(
+        service: IUserService,
+        limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+        offset: int = Query(0, ge=0),
+        # exact COUNT(*) is a full scan, so it is not available for anonymous clients
+        count_strategy: Literal["estimated", "cached"] = CountStrategy.ESTIMATED.value,
+) -> DTOResponse:
+    # DTOResponse skips response_model validation and jsonable_encoder, list is serialized once
+    return DTOResponse(await service.get_page(limit, offset, CountStrategy(count_strategy)))
@@ -1,6 +1,7 @@
 from typing import List
 
 from src.libs.exceptions import PaginationError
+from src.libs.pagination import CountStrategy
 from src.user.dependencies.repository import IUserRepository, UserRepository
 from src.user.dto import (
     UserDTO,
@@ -8,6 +9,7 @@ from src.user.dto import (
     FindUserDTO,
     PublicUserDTO,
     PrivateUserDTO,
+    UserListDTO,
 )
 
 
@@ -114,6 +116,30 @@ class UserService:
         raw_data_list = await self.repository.get_list(limit, offset)
         return [PublicUserDTO(name=raw_data.name) for raw_data in raw_data_list]
 
+    async def get_page(
+            self,
+            limit: int = 50,
+            offset: int = 0,
+            count_strategy: CountStrategy = CountStrategy.ESTIMATED
+    ) -> UserListDTO:
+        """
+        Get the page of users public data with total users count
+
+        uses to show list of other user public profiles with "page X of Y" navigation
+
+        Args:
+            limit: the number of users to show
+            offset: the number of users to skip
+            count_strategy: how to calculate total, see CountStrategy
+
+        Returns:
+            UserListDTO
+        """
+        items = await self.get_list(limit, offset)
+        total, used_strategy = await self.repository.count(count_strategy)
+
+        return UserListDTO(items=items, total=total, count_strategy=used_strategy)
+
     async def update_password(self, new_password: str, pk: int) -> UserDTO:
         """
         Change the password for the user by primary key
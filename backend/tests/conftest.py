@@ -0,0 +1,11 @@
+import os
+
+# settings are instantiated on import, so env has to be ready before src is imported
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("DB_NAME", "watchbook")
+os.environ.setdefault("DB_USER", "watchbook")
+os.environ.setdefault("DB_PASSWORD", "watchbook")
+# all test requests come from one client address
+os.environ.setdefault("ADMISSION_RATE", "1000000")
+os.environ.setdefault("ADMISSION_BURST", "1000000")
@@ -0,0 +1,100 @@
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+
+from src.libs.admission import AdmissionControlMiddleware
+
+
+def get_app(**middleware_kwargs) -> FastAPI:
+    app = FastAPI()
+    app.state.entered = asyncio.Event()
+    app.state.release = asyncio.Event()
+
+    @app.get("/health")
+    async def health():
+        return {"message": "healthy"}
+
+    @app.get("/healthz")
+    async def healthz():
+        return {"message": "healthy"}
+
+    @app.get("/items/")
+    async def items():
+        return {"message": "ok"}
+
+    @app.get("/slow/")
+    async def slow():
+        app.state.entered.set()
+        await app.state.release.wait()
+        return {"message": "ok"}
+
+    app.add_middleware(AdmissionControlMiddleware, **middleware_kwargs)
+    return app
+
+
+def get_client(app: FastAPI) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def test_rate_limit_responds_429_with_retry_after():
+    async def run():
+        async with get_client(get_app(rate=0.1, burst=1)) as client:
+            assert (await client.get("/items/")).status_code == 200
+
+            response = await client.get("/items/")
+            assert response.status_code == 429
+            assert int(response.headers["Retry-After"]) >= 1
+
+    asyncio.run(run())
+
+
+def test_overload_responds_503_with_retry_after():
+    async def run():
+        app = get_app(default_limit=1, max_queue=0, rate=1000, burst=1000)
+
+        async with get_client(app) as client:
+            first = asyncio.create_task(client.get("/slow/"))
+            await app.state.entered.wait()
+
+            response = await client.get("/items/")
+            assert response.status_code == 503
+            assert int(response.headers["Retry-After"]) >= 1
+
+            app.state.release.set()
+            assert (await first).status_code == 200
+            assert (await client.get("/items/")).status_code == 200
+
+    asyncio.run(run())
+
+
+def test_exempt_paths_are_matched_exactly():
+    async def run():
+        async with get_client(get_app(rate=0.1, burst=1)) as client:
+            for _ in range(5):
+                assert (await client.get("/health")).status_code == 200
+
+            assert (await client.get("/healthz")).status_code == 200
+            assert (await client.get("/healthz")).status_code == 429
+
+    asyncio.run(run())
+
+
+def test_route_limiter_is_matched_by_longest_prefix():
+    middleware = AdmissionControlMiddleware(
+        FastAPI(), route_limits={"/users/": 1, "/users/me/": 2}, default_limit=3
+    )
+
+    assert middleware._get_limiter("/users/me/properties/").limit == 2
+    assert middleware._get_limiter("/users/5/").limit == 1
+    assert middleware._get_limiter("/books/").limit == 3
+
+
+def test_buckets_are_capped_by_max_clients():
+    middleware = AdmissionControlMiddleware(FastAPI(), max_clients=2)
+
+    for key in ("a", "b", "a", "c"):
+        middleware._get_bucket(key)
+
+    # "b" is the least recently seen client
+    assert list(middleware.buckets) == ["a", "c"]
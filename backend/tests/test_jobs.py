@@ -0,0 +1,204 @@
+import asyncio
+
+import pytest
+
+from src.libs.exceptions import JobQueueFull
+from src.libs.jobs import JobRunner, SQLiteJobBackend
+
+
+async def wait_until(predicate, timeout: float = 2.0) -> None:
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def get_flaky_runner(failures: int, **runner_kwargs) -> tuple[JobRunner, list]:
+    runner = JobRunner(retry_backoff=0.01, **runner_kwargs)
+    calls = []
+
+    @runner.job("flaky")
+    async def flaky():
+        calls.append(1)
+        if len(calls) <= failures:
+            raise RuntimeError("failed")
+
+    return runner, calls
+
+
+def test_job_is_retried_until_success():
+    async def run():
+        runner, calls = get_flaky_runner(failures=2, max_retries=3)
+        await runner.start()
+        await runner.enqueue("flaky")
+
+        await wait_until(lambda: runner.metrics()["processed"] == 1)
+        await runner.stop(timeout=1)
+
+        assert len(calls) == 3
+        assert runner.metrics()["failed"] == 0
+
+    asyncio.run(run())
+
+
+def test_job_fails_after_max_retries():
+    async def run():
+        runner, calls = get_flaky_runner(failures=10, max_retries=2)
+        await runner.start()
+        await runner.enqueue("flaky")
+
+        await wait_until(lambda: runner.metrics()["failed"] == 1)
+        await runner.stop(timeout=1)
+
+        assert len(calls) == 3
+        assert runner.metrics()["processed"] == 0
+
+    asyncio.run(run())
+
+
+def test_retry_backoff_does_not_block_workers():
+    async def run():
+        runner = JobRunner(workers=1, max_retries=1, retry_backoff=10)
+        done = []
+
+        @runner.job("failing")
+        async def failing():
+            raise RuntimeError("failed")
+
+        @runner.job("ok")
+        async def ok():
+            done.append(1)
+
+        await runner.start()
+        await runner.enqueue("failing")
+        await runner.enqueue("ok")
+
+        await wait_until(lambda: done)
+        assert runner.metrics()["retries_scheduled"] == 1
+
+        await runner.stop(timeout=1)
+        assert runner.metrics()["retries_scheduled"] == 0
+
+    asyncio.run(run())
+
+
+def test_enqueue_raises_when_not_started_or_full():
+    async def run():
+        runner = JobRunner(workers=0, queue_size=1)
+
+        @runner.job("noop")
+        async def noop():
+            pass
+
+        with pytest.raises(JobQueueFull):
+            await runner.enqueue("noop")
+
+        await runner.start()
+        await runner.enqueue("noop")
+        with pytest.raises(JobQueueFull):
+            await runner.enqueue("noop")
+
+        await runner.stop(timeout=0.01)
+        with pytest.raises(JobQueueFull):
+            await runner.enqueue("noop")
+
+    asyncio.run(run())
+
+
+def test_stop_drains_queue():
+    async def run():
+        runner = JobRunner(workers=1)
+
+        @runner.job("slow")
+        async def slow():
+            await asyncio.sleep(0.02)
+
+        await runner.start()
+        for _ in range(3):
+            await runner.enqueue("slow")
+        await runner.stop(timeout=1)
+
+        assert runner.metrics()["processed"] == 3
+
+    asyncio.run(run())
+
+
+def test_stop_cancels_jobs_after_timeout():
+    async def run():
+        runner = JobRunner(workers=1)
+        started = asyncio.Event()
+
+        @runner.job("hanging")
+        async def hanging():
+            started.set()
+            await asyncio.Event().wait()
+
+        await runner.start()
+        await runner.enqueue("hanging")
+        await started.wait()
+        await runner.stop(timeout=0.05)
+
+        assert runner.metrics()["processed"] == 0
+
+    asyncio.run(run())
+
+
+def get_sqlite_runner(path: str, done: list, **backend_kwargs) -> JobRunner:
+    runner = JobRunner(backend=SQLiteJobBackend(path, **backend_kwargs))
+
+    @runner.job("record")
+    async def record(value: int):
+        done.append(value)
+
+    return runner
+
+
+def test_sqlite_jobs_are_claimed_by_one_runner_and_replayed_after_release(tmp_path):
+    async def run():
+        path = str(tmp_path / "jobs.db")
+        done = []
+
+        first = get_sqlite_runner(path, done)
+        first.workers = 0
+        await first.start()
+        await first.enqueue("record", value=1)
+        await first.enqueue("record", value=2)
+
+        # jobs are claimed by the first runner, the second one must not run them
+        second = get_sqlite_runner(path, done)
+        await second.start()
+        await asyncio.sleep(0.05)
+        await second.stop(timeout=1)
+        assert done == []
+
+        # not drained jobs are released on stop and replayed by the next runner
+        await first.stop(timeout=0.01)
+        third = get_sqlite_runner(path, done)
+        await third.start()
+        await third.stop(timeout=1)
+
+        assert sorted(done) == [1, 2]
+        assert await third.backend.load_pending() == []
+
+    asyncio.run(run())
+
+
+def test_sqlite_jobs_of_crashed_runner_are_replayed_after_lease(tmp_path):
+    async def run():
+        path = str(tmp_path / "jobs.db")
+        done = []
+
+        crashed = get_sqlite_runner(path, done)
+        crashed.workers = 0
+        await crashed.start()
+        await crashed.enqueue("record", value=1)
+
+        # crashed runner never releases its claims
+        recovering = get_sqlite_runner(path, done, lease=0)
+        await recovering.start()
+        await recovering.stop(timeout=1)
+
+        assert done == [1]
+
+    asyncio.run(run())
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.app import get_app
+from src.config.database.engine import DatabaseHelper, db_helper
+from src.libs.base_model import Base
+from src.libs.exceptions import ResourceLeak
+from src.libs.profiling import profiler
+from src.user.models.user import UserModel
+from src.user.models.user_property import UserPropertyModel  # noqa: F401
+
+WARMUP_REQUESTS = 200
+SOAK_REQUESTS = 5_000
+MAX_MEMORY_GROWTH = 2 * 1024 * 1024
+
+
+@pytest.fixture
+def profiling():
+    # only for these tests, tracemalloc slows down everything else
+    profiler.enabled = True
+    yield profiler
+    profiler.stop()
+
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite+aiosqlite:///{tmp_path / 'soak.db'}"
+
+
+async def get_test_db_helper(database_url: str) -> DatabaseHelper:
+    test_db_helper = DatabaseHelper(database_url)
+
+    async with test_db_helper.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    profiler.start(test_db_helper.engine)
+    return test_db_helper
+
+
+async def soak(database_url: str) -> None:
+    test_db_helper = await get_test_db_helper(database_url)
+
+    async with test_db_helper.get_db_session() as session:
+        session.add_all(
+            UserModel(name=f"user{i}", login=f"login{i}", email=f"user{i}@example.com", password="x")
+            for i in range(100)
+        )
+        await session.commit()
+
+    app = get_app()
+    app.dependency_overrides[db_helper.get_session] = test_db_helper.get_session
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        # caches (adapters, compiled statements, pool) are filled before the baseline
+        for _ in range(WARMUP_REQUESTS):
+            assert (await client.get("/users/", params={"limit": 10})).status_code == 200
+
+        baseline = profiler.snapshot()
+
+        for _ in range(SOAK_REQUESTS):
+            assert (await client.get("/users/", params={"limit": 10})).status_code == 200
+
+    profiler.check_growth(baseline, max_memory_growth=MAX_MEMORY_GROWTH)
+
+    snapshot = profiler.snapshot()
+    assert snapshot.sessions_opened - baseline.sessions_opened == SOAK_REQUESTS
+    assert snapshot.avg_dependencies_time > 0
+
+    await test_db_helper.engine.dispose()
+
+
+def test_sessions_and_memory_do_not_grow(profiling, database_url):
+    asyncio.run(soak(database_url))
+
+
+def test_leaked_session_is_detected(profiling, database_url):
+    async def run():
+        test_db_helper = await get_test_db_helper(database_url)
+        baseline = profiler.snapshot()
+
+        # session dependency which is never finished, so the session is never closed
+        leaked = test_db_helper.get_session()
+        await leaked.__anext__()
+
+        with pytest.raises(ResourceLeak, match="sessions left open"):
+            profiler.check_growth(baseline, max_memory_growth=MAX_MEMORY_GROWTH)
+
+        await leaked.aclose()
+        await test_db_helper.engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_checked_out_connection_is_detected(profiling, database_url):
+    async def run():
+        test_db_helper = await get_test_db_helper(database_url)
+        baseline = profiler.snapshot()
+
+        connection = await test_db_helper.engine.connect()
+
+        with pytest.raises(ResourceLeak, match="connections left checked out"):
+            profiler.check_growth(baseline, max_memory_growth=MAX_MEMORY_GROWTH)
+
+        await connection.close()
+        await test_db_helper.engine.dispose()
+
+    asyncio.run(run())